@@ -6,119 +6,494 @@ Date: August 2025
 Purpose: On-demand Instagram data extraction with fresh tokens per request
 """
 
-import instaloader
-import gspread
-import json
+import functools
+try:
+    import orjson as _json  # faster credentials parse when available
+except ImportError:
+    import json as _json
 import os
 import re
 import time
 import logging
 import random
+import shelve
 import string
-from datetime import datetime
-import pytz
-from google.oauth2.service_account import Credentials
-from typing import Optional, Dict, Any
+import threading
+import traceback
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
+
+# instaloader, gspread and google-auth are imported where first used so that
+# runs which exit early (missing configuration) skip their import cost
+if TYPE_CHECKING:
+    import instaloader
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Posts are fetched in parallel; kept low to stay under Instagram's rate limits
+DEFAULT_MAX_FETCH_WORKERS = 4
+
+# Finished rows are written in chunks of this size while later fetches continue
+FLUSH_EVERY_ROWS = 20
+
+# Compiled once: post/reel(s)/tv shortcode in a URL, and hashtags in a caption
+_SHORTCODE_RE = re.compile(r'/(?:p|reels?|tv)/([A-Za-z0-9_-]+)')
+_HASHTAG_RE = re.compile(r'#\w+')
+
+# Canonical instagram.com/<kind>/<code> links resolve without the regex
+_SHORTCODE_KINDS = frozenset(('p', 'reel', 'reels', 'tv'))
+_SHORTCODE_CHARS = string.ascii_letters + string.digits + '_-'
+_INSTAGRAM_URL_PREFIXES = frozenset(('', 'www.', 'http://', 'https://', 'http://www.', 'https://www.'))
+
+# Sheet header row (columns A-N)
+_HEADERS = (
+    'Action', 'Instagram URL', 'Account Handle', 'Likes Count',
+    'Comments Count', 'Views Count', 'Content Type', 'Posted Date',
+    'Caption Text', 'Hashtags Count', 'Location', 'Last Fetched',
+    'Processing Status', 'Last Updated'
+)
+
+# Extracted data keys in sheet order (columns C-L)
+_DATA_COLUMNS = ('account', 'likes', 'comments', 'views', 'type', 'posted_date',
+                 'caption', 'hashtags', 'location', 'last_fetched')
+
+# Number format applied to numeric cells instead of formatting counts in Python
+_COUNT_NUMBER_FORMAT = {'type': 'NUMBER', 'pattern': '#,##0'}
+
+# Successful extractions are cached on disk so re-runs skip Instagram
+CACHE_DIR = '.ig_cache'
+DEFAULT_CACHE_TTL_SECONDS = 900
+
+# Engagement on older posts plateaus, so their cache entries live longer:
+# (minimum post age in seconds, multiple of the base TTL), oldest first
+CACHE_TTL_AGE_TIERS = ((7 * 86400, 96), (86400, 4))
+
+# Captions are truncated for display, so only a bounded head is ever cleaned
+CAPTION_MAX_LENGTH = 200
+CAPTION_SCAN_LENGTH = 4 * CAPTION_MAX_LENGTH
+
+# Symbols (emoji etc.) and keycaps are first marked with U+FFFC, itself a symbol and
+# so never kept. Each mark then goes together with the joiners, variation selectors
+# and skin tones glued to it; elsewhere those stay, as ZWJ shapes Indic conjuncts
+_SYMBOL_MARK = '\ufffc'
+_EMOJI_COMPONENTS = '\u200d\ufe0e\ufe0f\U0001F3FB-\U0001F3FF'
+_EMOJI_SEQUENCE_RE = re.compile(f'[{_EMOJI_COMPONENTS}]*{_SYMBOL_MARK}(?:[{_EMOJI_COMPONENTS}]|{_SYMBOL_MARK})*')
+
+
+class _SymbolFilter(dict):
+    """str.translate table marking symbol characters (emoji etc.), filled on demand"""
+
+    def __missing__(self, codepoint: int) -> int:
+        # Each codepoint is categorized once; repeat lookups stay inside translate()
+        symbol = codepoint == 0x20E3 or unicodedata.category(chr(codepoint)) == 'So'
+        mapped = ord(_SYMBOL_MARK) if symbol else codepoint
+        self[codepoint] = mapped
+        return mapped
+
+
+_CAPTION_SYMBOLS = _SymbolFilter()
+
+# Optional Instagram login, kept between runs. It lives outside CACHE_DIR so the
+# shared post cache never stores login cookies; the workflow persists it encrypted
+SESSION_FILE = '.ig_session'
+
+# Browser user agents; one is picked per session
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/121.0'
+]
+
+# Transient Instagram failures are retried with full-jitter exponential backoff;
+# rate limits back off from a larger base, capped to fit the workflow's 8 minute timeout
+FETCH_ATTEMPTS = 3
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 60
+RATE_LIMIT_BACKOFF_BASE_SECONDS = 30
+RATE_LIMIT_BACKOFF_MAX_SECONDS = 120
+
+# A 429 on any worker pauses every worker's next request. Each further 429 doubles
+# the pause up to the cap, and each successful fetch shortens it by one base step
+RATE_LIMIT_PAUSE_BASE_SECONDS = 30
+RATE_LIMIT_PAUSE_MAX_SECONDS = 120
+
+# Posts still rate limited after every retry, in a row, before the rest of the run stops fetching
+RATE_LIMIT_BREAKER_THRESHOLD = 3
+
+# Requests allowed per query type within Instaloader's 11 minute sliding window.
+# A run fetches at most this many uncached posts: the next request would wait for
+# the window to slide, past the fetch time budget, so later posts are deferred
+DEFAULT_INSTAGRAM_REQUESTS_PER_WINDOW = 20
+
+# Seconds a run may spend fetching, leaving the workflow's 8 minute step timeout
+# room for setup, login and the final sheet flush
+DEFAULT_FETCH_TIME_BUDGET_SECONDS = 6 * 60
+
+# Statuses for posts left for a later run without being fetched; their rows stay marked PROCESS
+DEFERRED_RATE_BUDGET_STATUS = 'Deferred – rate budget'
+DEFERRED_RATE_LIMIT_STATUS = 'Deferred – rate limited'
+_DEFERRED_STATUSES = frozenset((DEFERRED_RATE_BUDGET_STATUS, DEFERRED_RATE_LIMIT_STATUS))
+
+
+class _FetchBudgetExceeded(Exception):
+    """A request would have to wait past the run's fetch deadline"""
+
+
+def _env_int(name: str, default: int) -> int:
+    """Integer setting from the environment; blank (an unset workflow variable) means the default"""
+    value = os.environ.get(name, '').strip()
+    return int(value) if value else default
+
+
+@functools.lru_cache(maxsize=None)
+def _rate_controller_class() -> type:
+    """Build the RateController subclass on first use, importing instaloader lazily"""
+    import instaloader
+
+    class ManualRateController(instaloader.RateController):
+        """Sliding-window rate controller shared by every session in a run"""
+
+        def __init__(self, context: 'instaloader.InstaloaderContext', requests_per_window: int,
+                     deadline: Optional[float]):
+            super().__init__(context)
+            self._lock = threading.Lock()
+            self._requests_per_window = requests_per_window
+            # time.monotonic() after which no request may start
+            self._deadline = deadline
+            # Shared 429 pause; its own lock, so recording outcomes never waits on a sleep
+            self._pause_lock = threading.Lock()
+            self._pause = 0.0
+            self._resume_at = 0.0
+
+        def count_per_sliding_window(self, query_type: str) -> int:
+            return self._requests_per_window
+
+        def penalize(self) -> float:
+            """Hold back every session's next request after a 429; returns the pause"""
+            with self._pause_lock:
+                self._pause = min(RATE_LIMIT_PAUSE_MAX_SECONDS, self._pause * 2 or RATE_LIMIT_PAUSE_BASE_SECONDS)
+                self._resume_at = max(self._resume_at, time.monotonic() + self._pause)
+                return self._pause
+
+        def record_success(self) -> None:
+            """Shorten the pause the next 429 starts from"""
+            with self._pause_lock:
+                self._pause = max(0.0, self._pause - RATE_LIMIT_PAUSE_BASE_SECONDS)
+
+        def wait_before_query(self, query_type: str) -> None:
+            # Serialize scheduling so parallel workers draw from one request budget
+            with self._lock:
+                now = time.monotonic()
+                with self._pause_lock:
+                    paused = max(0.0, self._resume_at - now)
+
+                if self._deadline is not None:
+                    waittime = paused + self.query_waittime(query_type, now + paused, False)
+                    if now + waittime > self._deadline:
+                        raise _FetchBudgetExceeded(f"next request would wait {waittime:.0f}s, "
+                                                   f"past the run's fetch time budget")
+
+                if paused:
+                    self.sleep(paused)
+                super().wait_before_query(query_type)
+
+    return ManualRateController
+
+
 class ManualInstagramProcessor:
     """Manual Instagram processor with fresh tokens"""
 
-    def __init__(self, sheet_id: str, credentials_json: str):
+    def __init__(self, sheet_id: str, credentials_json: Optional[str] = None,
+                 credentials_path: Optional[str] = None):
         self.sheet_id = sheet_id
+        # Service account key, either inline JSON or a key file path (which wins if both are set)
         self.credentials_json = credentials_json
+        self.credentials_path = credentials_path
         self.google_sheet = None
         self.worksheet = None
-        self.ist_timezone = pytz.timezone('Asia/Kolkata')
+        self.ist_timezone = ZoneInfo('Asia/Kolkata')
+        # IST timestamp of the current run, stamped into every row it writes
+        self._run_timestamp = None
+        self.max_fetch_workers = max(1, _env_int('MAX_FETCH_WORKERS', DEFAULT_MAX_FETCH_WORKERS))
+
+        # Row writes are queued as Sheets API requests (one list per row) and
+        # flushed together, values and formatting in a single batchUpdate call
+        self._pending_rows = []
+        self._pending_lock = threading.Lock()
+
+        # Shortcode -> {'d': data, 't': fetched epoch, 'p': posted epoch}, shared by fetch workers
+        self.cache_ttl = _env_int('CACHE_TTL_SECONDS', DEFAULT_CACHE_TTL_SECONDS)
+        self._cache = None
+        self._cache_lock = threading.Lock()
+
+        self.requests_per_window = max(1, _env_int('INSTAGRAM_REQUESTS_PER_WINDOW', DEFAULT_INSTAGRAM_REQUESTS_PER_WINDOW))
+        self._rate_controller = None
+        self._rate_controller_lock = threading.Lock()
+        self.fetch_time_budget = _env_int('FETCH_TIME_BUDGET_SECONDS', DEFAULT_FETCH_TIME_BUDGET_SECONDS)
+        # Set when a run starts; fetches that would wait past it are deferred to the next run
+        self._fetch_deadline = None
+
+        # Circuit breaker: consecutive posts that stayed rate limited through all retries
+        self._consecutive_rate_limits = 0
+        self._breaker_lock = threading.Lock()
+
+        # One loader per fetch worker so its HTTP session and connections are reused
+        self._thread_local = threading.local()
+        self._loaders = []
+        self._loaders_lock = threading.Lock()
+
+        # Resolving a post's location costs a second request on logged-in sessions
+        self.fetch_location = os.environ.get('FETCH_LOCATION', '').strip().lower() in ('1', 'true', 'yes')
+
+        self.instagram_username = os.environ.get('INSTAGRAM_USERNAME')
+        self.instagram_password = os.environ.get('INSTAGRAM_PASSWORD')
+        # Validated login cookies handed to every fetch worker
+        self._session_data = None
 
         self._initialize_google_sheets()
+        self._initialize_post_cache()
 
     def _initialize_google_sheets(self):
         """Initialize Google Sheets service only"""
+        import gspread
+        from google.oauth2.service_account import Credentials
+
         try:
             scopes = [
                 "https://www.googleapis.com/auth/spreadsheets",
                 "https://www.googleapis.com/auth/drive"
             ]
 
-            creds_dict = json.loads(self.credentials_json)
-            credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
+            if self.credentials_path:
+                credentials = Credentials.from_service_account_file(self.credentials_path, scopes=scopes)
+            else:
+                creds_dict = _json.loads(self.credentials_json)
+                credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
 
             gc = gspread.authorize(credentials)
             self.google_sheet = gc.open_by_key(self.sheet_id)
             self.worksheet = self.google_sheet.get_worksheet(0)
 
-            self._setup_professional_headers()
             logger.info("Google Sheets service initialized")
 
         except Exception as e:
             logger.error(f"Google Sheets initialization failed: {e}")
             raise
 
-    def _setup_professional_headers(self):
-        """Setup clean, professional headers"""
-        headers = [
-            'Action', 'Instagram URL', 'Account Handle', 'Likes Count', 
-            'Comments Count', 'Views Count', 'Content Type', 'Posted Date', 
-            'Caption Text', 'Hashtags Count', 'Location', 'Last Fetched', 
-            'Processing Status', 'Last Updated'
-        ]
-
+    def _initialize_post_cache(self):
+        """Open the on-disk post cache; processing continues without it on failure"""
         try:
-            current_headers = self.worksheet.row_values(1) if self.worksheet.row_count > 0 else []
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            self._cache = shelve.open(os.path.join(CACHE_DIR, 'posts'))
+            logger.info(f"Post cache opened (TTL {self.cache_ttl}s)")
+
+        except Exception as e:
+            logger.warning(f"Post cache unavailable: {e}")
+            self._cache = None
+
+    def _cache_ttl_for(self, posted_at: Optional[float], now: float) -> float:
+        """TTL for a cached post, growing with the post's age"""
+        if posted_at is not None:
+            age = now - posted_at
+            for min_age, multiple in CACHE_TTL_AGE_TIERS:
+                if age >= min_age:
+                    return self.cache_ttl * multiple
+        return self.cache_ttl
+
+    def _get_cached_post(self, shortcode: str) -> Optional[Dict[str, Any]]:
+        """Return cached post data if it is still within its TTL"""
+        if self._cache is None:
+            return None
 
-            if not current_headers or len(current_headers) < len(headers):
-                self.worksheet.clear()
-                self.worksheet.append_row(headers)
+        with self._cache_lock:
+            entry = self._cache.get(shortcode)
 
-                # Professional header formatting - simple and clean
-                self.worksheet.format('A1:N1', {
-                    'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
-                    'textFormat': {'bold': True},
-                    'horizontalAlignment': 'CENTER'
-                })
+        now = time.time()
+        if entry and now - entry['t'] < self._cache_ttl_for(entry.get('p'), now):
+            return entry['d']
+        return None
 
-                # Set column widths
-                self.worksheet.format('A:A', {'columnWidth': 100})  # Action button column
-                self.worksheet.format('B:B', {'columnWidth': 300})  # URL column
-                self.worksheet.format('I:I', {'columnWidth': 250})  # Caption column
+    def _store_cached_post(self, shortcode: str, data: Dict[str, Any], posted_at: Optional[float]):
+        """Remember successfully extracted post data and when the post was published"""
+        if self._cache is None:
+            return
+
+        with self._cache_lock:
+            self._cache[shortcode] = {'d': data, 't': time.time(), 'p': posted_at}
+
+    def __enter__(self) -> 'ManualInstagramProcessor':
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def close(self):
+        """Close Instagram and Sheets HTTP sessions and flush the post cache"""
+        with self._loaders_lock:
+            loaders, self._loaders = self._loaders, []
+        for loader in loaders:
+            try:
+                loader.close()
+            except Exception as e:
+                logger.warning(f"Failed to close Instagram session: {e}")
+
+        if self.google_sheet is not None:
+            try:
+                self.google_sheet.client.session.close()
+            except Exception as e:
+                logger.warning(f"Failed to close Google Sheets session: {e}")
+
+        if self._cache is not None:
+            with self._cache_lock:
+                self._cache.close()
+            self._cache = None
+
+    def _read_request_columns(self) -> List[List[str]]:
+        """Read the header row and the Action/URL columns in one batchGet call"""
+        from gspread.utils import absolute_range_name
+
+        title = self.worksheet.title
+        response = self.google_sheet.values_batch_get(
+            ranges=[absolute_range_name(title, 'A1:N1'), absolute_range_name(title, 'A2:B')]
+        )
+        header_range, request_range = response.get('valueRanges', [{}, {}])
+
+        # Keep row 1 in place even when it is empty so list indices stay row numbers - 1
+        headers = header_range.get('values', [[]])[0]
+        return [headers] + request_range.get('values', [])
+
+    def _setup_professional_headers(self, current_headers: List[str]) -> bool:
+        """Setup clean, professional headers; returns True if the sheet was reset"""
+        try:
+            if not current_headers or len(current_headers) < len(_HEADERS):
+                sheet_id = self.worksheet.id
+                header_range = {
+                    'sheetId': sheet_id,
+                    'startRowIndex': 0, 'endRowIndex': 1,
+                    'startColumnIndex': 0, 'endColumnIndex': len(_HEADERS)
+                }
+
+                # Action button, URL and caption columns
+                column_widths = {0: 100, 1: 300, 8: 250}
+
+                # Clear, header values, formatting and widths in one request
+                requests = [
+                    {'updateCells': {'range': {'sheetId': sheet_id}, 'fields': 'userEnteredValue'}},
+                    {'updateCells': {
+                        'range': header_range,
+                        'rows': [{'values': [{'userEnteredValue': {'stringValue': h}} for h in _HEADERS]}],
+                        'fields': 'userEnteredValue'
+                    }},
+                    # Professional header formatting - simple and clean
+                    {'repeatCell': {
+                        'range': header_range,
+                        'cell': {'userEnteredFormat': {
+                            'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
+                            'textFormat': {'bold': True},
+                            'horizontalAlignment': 'CENTER'
+                        }},
+                        'fields': 'userEnteredFormat(backgroundColor,textFormat,horizontalAlignment)'
+                    }}
+                ] + [
+                    {'updateDimensionProperties': {
+                        'range': {'sheetId': sheet_id, 'dimension': 'COLUMNS', 'startIndex': col, 'endIndex': col + 1},
+                        'properties': {'pixelSize': width},
+                        'fields': 'pixelSize'
+                    }}
+                    for col, width in column_widths.items()
+                ]
+
+                self.google_sheet.batch_update({'requests': requests})
 
                 logger.info("Professional headers configured")
+                return True
 
         except Exception as e:
             logger.error(f"Header setup failed: {e}")
 
-    def _create_fresh_instagram_session(self) -> Optional[instaloader.Instaloader]:
-        """Create completely fresh Instagram session with new identity"""
+        return False
+
+    def _get_rate_controller(self, context: 'instaloader.InstaloaderContext') -> 'instaloader.RateController':
+        """Return the run-wide rate controller, creating it for the first session"""
+        with self._rate_controller_lock:
+            if self._rate_controller is None:
+                self._rate_controller = _rate_controller_class()(context, self.requests_per_window,
+                                                                 self._fetch_deadline)
+            return self._rate_controller
+
+    def _new_instagram_loader(self) -> 'instaloader.Instaloader':
+        """Create a metadata-only loader with a browser user agent"""
+        import instaloader
+
+        return instaloader.Instaloader(
+            # Pacing comes from the shared rate controller, not per-request jitter
+            sleep=False,
+            download_pictures=False,
+            download_videos=False,
+            save_metadata=False,
+            quiet=True,
+            dirname_pattern='',
+            filename_pattern='',
+            post_metadata_txt_pattern='',
+            storyitem_metadata_txt_pattern='',
+            user_agent=random.choice(USER_AGENTS),
+            rate_controller=self._get_rate_controller,
+            # _fetch_post is the only retry layer; instaloader's own retries would stack
+            # on it and wait out handle_429 for 11 minutes, past the step timeout
+            max_connection_attempts=1
+        )
+
+    def _prepare_instagram_login(self):
+        """Reuse the saved login if it is still valid, otherwise log in again and save it"""
+        if not self.instagram_username:
+            return
+
+        loader = self._new_instagram_loader()
+        try:
+            if os.path.exists(SESSION_FILE):
+                try:
+                    loader.load_session_from_file(self.instagram_username, SESSION_FILE)
+                    if loader.test_login() == self.instagram_username:
+                        self._session_data = loader.save_session()
+                        logger.info(f"Reusing saved Instagram session for @{self.instagram_username}")
+                        return
+                    logger.warning("Saved Instagram session is no longer valid; logging in again")
+                except Exception as e:
+                    logger.warning(f"Saved Instagram session could not be loaded, logging in again: {e}")
+
+            if not self.instagram_password:
+                logger.warning("INSTAGRAM_USERNAME set without a valid saved session or password; using anonymous sessions")
+                return
+
+            loader.login(self.instagram_username, self.instagram_password)
+            loader.save_session_to_file(SESSION_FILE)
+            self._session_data = loader.save_session()
+            logger.info(f"Instagram session saved for @{self.instagram_username}")
+
+        except Exception as e:
+            logger.error(f"Instagram login failed, using anonymous sessions: {e}")
+
+        finally:
+            loader.close()
+
+    def _create_fresh_instagram_session(self) -> Optional['instaloader.Instaloader']:
+        """Create fresh Instagram session, reusing the saved login if there is one"""
         try:
             # Generate random session identifier
             session_id = ''.join(random.choices(string.ascii_letters + string.digits, k=12))
 
             # Create fresh loader
-            loader = instaloader.Instaloader(
-                download_pictures=False,
-                download_videos=False,
-                save_metadata=False,
-                quiet=True,
-                dirname_pattern='',
-                filename_pattern='',
-                post_metadata_txt_pattern='',
-                storyitem_metadata_txt_pattern=''
-            )
-
-            # Randomize user agent
-            user_agents = [
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/121.0'
-            ]
+            loader = self._new_instagram_loader()
 
-            loader.context.user_agent = random.choice(user_agents)
+            if self._session_data:
+                loader.load_session(self.instagram_username, self._session_data)
 
             logger.info(f"Fresh Instagram session created: {session_id}")
             return loader
@@ -127,6 +502,83 @@ class ManualInstagramProcessor:
             logger.error(f"Failed to create fresh session: {e}")
             return None
 
+    def _get_instagram_session(self) -> Optional['instaloader.Instaloader']:
+        """Return this worker thread's loader, creating it on first use"""
+        loader = getattr(self._thread_local, 'loader', None)
+        if loader is None:
+            loader = self._create_fresh_instagram_session()
+            if loader is not None:
+                self._thread_local.loader = loader
+                with self._loaders_lock:
+                    self._loaders.append(loader)
+        return loader
+
+    def _fetch_post(self, loader: 'instaloader.Instaloader', shortcode: str) -> 'instaloader.Post':
+        """Fetch a post, backing off and retrying on rate limits and connection errors"""
+        import instaloader
+
+        for attempt in range(FETCH_ATTEMPTS):
+            try:
+                post = instaloader.Post.from_shortcode(loader.context, shortcode)
+                self._rate_controller.record_success()
+                return post
+
+            except instaloader.exceptions.QueryReturnedNotFoundException:
+                raise
+
+            except instaloader.exceptions.ConnectionException as e:
+                rate_limited = isinstance(self._unwrap_fetch_error(e), instaloader.exceptions.TooManyRequestsException)
+                if rate_limited:
+                    # With max_connection_attempts=1 instaloader never calls handle_429,
+                    # so the shared controller is told here and holds back every worker
+                    pause = self._rate_controller.penalize()
+                    logger.warning(f"Rate limited on {shortcode}; pausing Instagram requests for {pause:.0f}s")
+
+                # Login walls and private posts are InstaloaderExceptions and are never retried
+                if attempt + 1 == FETCH_ATTEMPTS:
+                    raise
+
+                if rate_limited:
+                    base, cap = RATE_LIMIT_BACKOFF_BASE_SECONDS, RATE_LIMIT_BACKOFF_MAX_SECONDS
+                else:
+                    base, cap = BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS
+
+                # Full jitter keeps parallel workers from retrying in lockstep
+                delay = random.uniform(0, min(cap, base * 2 ** attempt))
+                if self._fetch_deadline is not None and time.monotonic() + delay > self._fetch_deadline:
+                    raise
+
+                logger.warning(f"Transient error for {shortcode} (attempt {attempt + 1}/{FETCH_ATTEMPTS}), "
+                               f"retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
+
+    def _unwrap_fetch_error(self, error: Exception) -> Exception:
+        """Return the HTTP error instaloader wraps in a ConnectionException on its last attempt"""
+        import instaloader
+
+        cause = error.__cause__
+        if (isinstance(error, instaloader.exceptions.ConnectionException)
+                and isinstance(cause, instaloader.exceptions.InstaloaderException)):
+            return cause
+        return error
+
+    def _rate_limit_breaker_open(self) -> bool:
+        """Whether Instagram has rate limited enough posts in a row to stop fetching"""
+        with self._breaker_lock:
+            return self._consecutive_rate_limits >= RATE_LIMIT_BREAKER_THRESHOLD
+
+    def _record_fetch_outcome(self, rate_limited: bool):
+        """Count consecutive rate-limited posts; any other outcome closes the breaker"""
+        with self._breaker_lock:
+            if not rate_limited:
+                self._consecutive_rate_limits = 0
+                return
+
+            self._consecutive_rate_limits += 1
+            if self._consecutive_rate_limits == RATE_LIMIT_BREAKER_THRESHOLD:
+                logger.error(f"Rate limited on {RATE_LIMIT_BREAKER_THRESHOLD} posts in a row; "
+                             f"skipping remaining Instagram fetches this run")
+
     def _get_ist_timestamp(self) -> str:
         """Get current IST timestamp in professional format"""
         return datetime.now(self.ist_timezone).strftime('%d-%m-%Y %H:%M:%S')
@@ -134,216 +586,357 @@ class ManualInstagramProcessor:
     def _extract_shortcode(self, url: str) -> Optional[str]:
         """Extract shortcode from Instagram URL"""
         url = url.strip()
-        patterns = [
-            r'/p/([A-Za-z0-9_-]+)',
-            r'/reel/([A-Za-z0-9_-]+)', 
-            r'/tv/([A-Za-z0-9_-]+)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
 
-    def _extract_instagram_data(self, url: str, row_number: int) -> tuple[Optional[Dict[str, Any]], str]:
-        """Extract Instagram data with fresh session"""
-        shortcode = self._extract_shortcode(url)
-        if not shortcode:
-            return None, "Invalid URL format"
+        # Fast path: plain string splits for the common instagram.com/<kind>/<code>/ shape
+        prefix, found, path = url.partition('instagram.com/')
+        if found and prefix in _INSTAGRAM_URL_PREFIXES:
+            kind, _, rest = path.partition('/')
+            code = rest.split('/', 1)[0].split('?', 1)[0]
+            if kind in _SHORTCODE_KINDS and code and not code.strip(_SHORTCODE_CHARS):
+                return code
+
+        match = _SHORTCODE_RE.search(url)
+        return match.group(1) if match else None
+
+    def _extract_instagram_data(self, shortcode: str, row_number: int) -> tuple[Optional[Dict[str, Any]], str]:
+        """Extract Instagram data using the worker's session"""
+        import instaloader
+
+        cached_data = self._get_cached_post(shortcode)
+        if cached_data:
+            logger.info(f"Using cached data for row {row_number}: {shortcode}")
+            return cached_data, "Success"
 
-        # Create completely fresh session
-        instagram_loader = self._create_fresh_instagram_session()
+        if self._rate_limit_breaker_open():
+            return None, DEFERRED_RATE_LIMIT_STATUS
+
+        instagram_loader = self._get_instagram_session()
         if not instagram_loader:
             return None, "Session creation failed"
 
         try:
             logger.info(f"Processing row {row_number}: {shortcode}")
 
-            # Add random delay to appear more human
-            time.sleep(random.uniform(1, 3))
-
             # Extract post data
-            post = instaloader.Post.from_shortcode(instagram_loader.context, shortcode)
-
-            # Get timestamps
-            current_ist = self._get_ist_timestamp()
-            posted_ist = post.date.astimezone(self.ist_timezone).strftime('%d-%m-%Y %H:%M') if post.date else 'Unknown'
+            fetch_started = time.monotonic()
+            post = self._fetch_post(instagram_loader, shortcode)
+            fetch_seconds = time.monotonic() - fetch_started
+            self._record_fetch_outcome(rate_limited=False)
+
+            # Post fields are properties over instaloader's node dict; read each once
+            posted_date = post.date_utc
+            is_video = post.is_video
+            likes = post.likes
+            comments = post.comments
+            location = post.location if self.fetch_location else None
+
+            # date_utc is naive UTC, so pin it to an epoch rather than letting
+            # astimezone() read it as host-local time; the epoch also feeds cache TTLs
+            posted_at = posted_date.replace(tzinfo=timezone.utc).timestamp() if posted_date else None
+            posted_ist = (datetime.fromtimestamp(posted_at, tz=self.ist_timezone).strftime('%d-%m-%Y %H:%M')
+                          if posted_at is not None else 'Unknown')
+
+            # Only videos carry a view count; read it once instead of hasattr + access
+            views = 0
+            if is_video:
+                try:
+                    views = post.video_view_count or 0
+                except (KeyError, AttributeError):
+                    views = 0
+
+            caption, hashtags = self._clean_caption(post.caption)
 
             # Clean and extract data
             data = {
                 'account': post.owner_username,
-                'likes': post.likes if post.likes else 0,
-                'comments': post.comments if post.comments else 0,
-                'views': post.video_view_count if (post.is_video and hasattr(post, 'video_view_count') and post.video_view_count) else 0,
-                'type': 'Video' if post.is_video else 'Photo',
+                'likes': likes or 0,
+                'comments': comments or 0,
+                'views': views,
+                'type': 'Video' if is_video else 'Photo',
                 'posted_date': posted_ist,
-                'caption': self._clean_caption(post.caption),
-                'hashtags': len(re.findall(r'#\w+', post.caption)) if post.caption else 0,
-                'location': post.location.name if post.location else 'Not specified',
-                'last_fetched': current_ist,
-                'last_updated': current_ist
+                'caption': caption,
+                'hashtags': hashtags,
+                'location': location.name if location else ('Not specified' if self.fetch_location else 'Not fetched'),
+                'last_fetched': self._run_timestamp
             }
 
-            logger.info(f"Successfully extracted data for @{data['account']}")
+            logger.info(f"Successfully extracted data for @{data['account']} in {fetch_seconds:.2f}s")
+            self._store_cached_post(shortcode, data, posted_at)
             return data, "Success"
 
+        except _FetchBudgetExceeded as e:
+            # Says nothing about Instagram, so the breaker is left alone
+            logger.warning(f"Deferred {shortcode} to the next run: {e}")
+            return None, DEFERRED_RATE_BUDGET_STATUS
+
         except Exception as e:
             logger.error(f"Data extraction failed for {shortcode}: {str(e)}")
-            error_type = "Private content" if "private" in str(e).lower() else "Extraction failed"
-            return None, error_type
-
-        finally:
-            # Cleanup session completely
-            try:
-                if hasattr(instagram_loader.context, 'session'):
-                    instagram_loader.context.session.close()
-            except:
-                pass
-
-    def _clean_caption(self, caption: str) -> str:
-        """Clean caption text professionally"""
+            self._record_fetch_outcome(rate_limited=isinstance(self._unwrap_fetch_error(e),
+                                                                instaloader.exceptions.TooManyRequestsException))
+            return None, self._classify_fetch_error(e)
+
+    def _classify_fetch_error(self, error: Exception) -> str:
+        """Map a failed fetch to the status written to the sheet"""
+        import instaloader
+
+        exceptions = instaloader.exceptions
+        error = self._unwrap_fetch_error(error)
+        if isinstance(error, exceptions.TooManyRequestsException):
+            return "Rate limited"
+        if isinstance(error, exceptions.QueryReturnedNotFoundException):
+            return "Post not found"
+        if isinstance(error, exceptions.PrivateProfileNotFollowedException):
+            return "Private content"
+        if isinstance(error, exceptions.LoginRequiredException):
+            return "Login required"
+        if isinstance(error, exceptions.ConnectionException):
+            return "Connection failed"
+
+        # Older instaloader releases report some private posts only in the message
+        return "Private content" if "private" in str(error).lower() else "Extraction failed"
+
+    def _clean_caption(self, caption: str) -> tuple[str, int]:
+        """Clean caption text professionally; also returns its hashtag count"""
         if not caption:
-            return "No caption"
-
-        # Remove excessive whitespace and emojis for professional display
-        cleaned = ' '.join(str(caption).split())
+            return "No caption", 0
+
+        # Hashtags anywhere in the caption count, even past the display cut;
+        # most captions have none, which a plain substring scan settles
+        text = str(caption)
+        hashtags = sum(1 for _ in _HASHTAG_RE.finditer(text)) if '#' in text else 0
+
+        # Only the head that can reach the output is cleaned. Emojis and other
+        # symbols go first so the spaces around them collapse below
+        head = text[:CAPTION_SCAN_LENGTH].translate(_CAPTION_SYMBOLS)
+        if _SYMBOL_MARK in head:
+            head = _EMOJI_SEQUENCE_RE.sub('', head)
+
+        # isprintable() rejects every whitespace but ' ', so a printable head
+        # without doubled or edge spaces is already normalized
+        if head.isprintable() and '  ' not in head and head[:1] != ' ' and head[-1:] != ' ':
+            professional_text = head
+        else:
+            professional_text = ' '.join(head.split())
 
-        # Remove most emojis and special characters
-        import unicodedata
-        professional_text = ''.join(char for char in cleaned 
-                                   if unicodedata.category(char)[0] != 'So' 
-                                   or char in ' .,!?-_@#()[]{}')
+        if not professional_text:
+            return "No caption", hashtags
 
         # Truncate for professional display
-        if len(professional_text) > 200:
-            return professional_text[:200] + "..."
+        if len(professional_text) > CAPTION_MAX_LENGTH or len(text) > CAPTION_SCAN_LENGTH:
+            return professional_text[:CAPTION_MAX_LENGTH] + "...", hashtags
 
-        return professional_text
+        return professional_text, hashtags
 
-    def _find_requested_row(self) -> Optional[int]:
-        """Find row that has been requested for processing"""
+    def _find_requested_rows(self, all_data: List[List[str]]) -> List[int]:
+        """Find rows that have been requested for processing"""
         try:
+            # One pass over the in-memory rows for "PROCESS" actions. A TARGET_ROW run
+            # takes them too, since it may have replaced a queued run that needed them
+            requested_rows = [
+                row_index for row_index, row in enumerate(all_data[1:], start=2)
+                if row and 'PROCESS' in row[0].upper()
+            ]
+
             # Get environment variable for specific row
             target_row = os.environ.get('TARGET_ROW')
             if target_row and target_row.isdigit():
-                return int(target_row)
+                # Row 1 is the header, and 0 would index the sheet from the end
+                if int(target_row) < 2:
+                    logger.error(f"TARGET_ROW must be a data row (2 or higher), got {target_row}")
+                elif int(target_row) not in requested_rows:
+                    requested_rows.insert(0, int(target_row))
 
-            # Fallback: find first row with "PROCESS" in action column
-            all_data = self.worksheet.get_all_values()
-
-            for row_index, row in enumerate(all_data[1:], start=2):
-                if len(row) > 0 and row[0] and 'PROCESS' in str(row[0]).upper():
-                    return row_index
-
-            logger.info("No processing requests found")
-            return None
+            if not requested_rows:
+                logger.info("No processing requests found")
+            return requested_rows
 
         except Exception as e:
-            logger.error(f"Error finding requested row: {e}")
-            return None
+            logger.error(f"Error finding requested rows: {e}")
+            return []
+
+    def _row_range(self, row_num: int, start_col: int, end_col: int) -> Dict[str, int]:
+        """GridRange covering columns [start_col, end_col) of one sheet row"""
+        return {
+            'sheetId': self.worksheet.id,
+            'startRowIndex': row_num - 1, 'endRowIndex': row_num,
+            'startColumnIndex': start_col, 'endColumnIndex': end_col
+        }
+
+    def _cells_request(self, row_num: int, start_col: int, values: List[Any],
+                       background_color: Dict[str, float]) -> Dict[str, Any]:
+        """updateCells request writing values and background from start_col"""
+        text_format = {'backgroundColor': background_color}
+        count_format = {'backgroundColor': background_color, 'numberFormat': _COUNT_NUMBER_FORMAT}
+
+        return {'updateCells': {
+            'range': self._row_range(row_num, start_col, start_col + len(values)),
+            'rows': [{'values': [
+                {'userEnteredValue': {'numberValue': value}, 'userEnteredFormat': count_format}
+                if isinstance(value, int) else
+                {'userEnteredValue': {'stringValue': value}, 'userEnteredFormat': text_format}
+                for value in values
+            ]}],
+            'fields': 'userEnteredValue,userEnteredFormat.backgroundColor,userEnteredFormat.numberFormat'
+        }}
+
+    def _queue_sheet_update(self, row_num: int, url: str, data: Optional[Dict], status: str):
+        """Queue a clean, professionally formatted row for the next flush"""
+        current_ist = self._run_timestamp
+
+        if data and status == "Success":
+            # Counts stay numeric; the sheet renders thousands separators
+            row_data = [
+                'COMPLETED',  # Clear action button
+                url,
+                *(data[column] for column in _DATA_COLUMNS),
+                'Success',
+                current_ist
+            ]
 
-    def _update_sheet_professionally(self, row_num: int, url: str, data: Optional[Dict], status: str):
-        """Update sheet with clean, professional formatting"""
-        try:
-            current_ist = self._get_ist_timestamp()
-
-            if data and status == "Success":
-                # Professional number formatting
-                likes_formatted = f"{data['likes']:,}" if isinstance(data['likes'], int) else str(data['likes'])
-                comments_formatted = f"{data['comments']:,}" if isinstance(data['comments'], int) else str(data['comments'])
-                views_formatted = f"{data['views']:,}" if isinstance(data['views'], int) else str(data['views'])
-
-                row_data = [
-                    'COMPLETED',  # Clear action button
-                    url,
-                    data['account'],
-                    likes_formatted,
-                    comments_formatted,
-                    views_formatted,
-                    data['type'],
-                    data['posted_date'],
-                    data['caption'],
-                    str(data['hashtags']),
-                    data['location'],
-                    data['last_fetched'],
-                    'Success',
-                    current_ist
-                ]
+            # Professional success formatting - light gray
+            background_color = {'red': 0.95, 'green': 0.98, 'blue': 0.95}
+            requests = [self._cells_request(row_num, 0, row_data, background_color)]
 
-                # Professional success formatting - light gray
-                background_color = {'red': 0.95, 'green': 0.98, 'blue': 0.95}
+        else:
+            # Professional error formatting - light red. Only the action and status
+            # cells change; the URL and any data from an earlier fetch (B-L) are kept.
+            # Deferred rows stay requested so the next run picks them up
+            background_color = {'red': 0.98, 'green': 0.95, 'blue': 0.95}
+            status_col = len(_HEADERS) - 2
+            action = 'PROCESS' if status in _DEFERRED_STATUSES else 'FAILED'
+            requests = [
+                self._cells_request(row_num, 0, [action], background_color),
+                {'repeatCell': {
+                    'range': self._row_range(row_num, 1, status_col),
+                    'cell': {'userEnteredFormat': {'backgroundColor': background_color}},
+                    'fields': 'userEnteredFormat.backgroundColor'
+                }},
+                self._cells_request(row_num, status_col, [status, current_ist], background_color)
+            ]
 
-            else:
-                # Professional error formatting
-                row_data = [
-                    'FAILED',
-                    url,
-                    '', '', '', '', '', '', '', '', '',
-                    current_ist,
-                    status,
-                    current_ist
-                ]
+        with self._pending_lock:
+            self._pending_rows.append(requests)
 
-                # Professional error formatting - light red
-                background_color = {'red': 0.98, 'green': 0.95, 'blue': 0.95}
+    def _flush_sheet_updates(self) -> bool:
+        """Write all queued rows, values and formatting, in one batchUpdate call"""
+        with self._pending_lock:
+            rows, self._pending_rows = self._pending_rows, []
 
-            # Update row
-            self.worksheet.update(f'A{row_num}:N{row_num}', [row_data])
+        if not rows:
+            return True
 
-            # Apply professional formatting
-            self.worksheet.format(f'A{row_num}:N{row_num}', {
-                'backgroundColor': background_color
-            })
+        try:
+            self.google_sheet.batch_update({'requests': [request for row in rows for request in row]})
 
-            logger.info(f"Sheet updated professionally for row {row_num}")
+            logger.info(f"Sheet updated professionally for {len(rows)} row(s)")
             return True
 
         except Exception as e:
-            logger.error(f"Sheet update failed for row {row_num}: {e}")
+            logger.error(f"Sheet batch update failed: {e}")
             return False
 
+    def _group_requested_rows(self, all_data: List[List[str]],
+                              requested_rows: List[int]) -> Dict[str, List[Tuple[int, str]]]:
+        """Validate requested rows and group them by post so each post is fetched once"""
+        posts = {}
+
+        for row_num in requested_rows:
+            row_data = all_data[row_num - 1] if 2 <= row_num <= len(all_data) else []
+            if len(row_data) < 2 or not row_data[1]:
+                logger.error(f"No URL found in row {row_num}")
+                continue
+
+            url = row_data[1].strip()
+
+            # One parse validates and extracts; the slower checks only label rejects.
+            # Unparseable URLs are settled here without touching Instagram
+            shortcode = self._extract_shortcode(url)
+            if not shortcode or 'instagram.com' not in url:
+                if url.startswith('http') and 'instagram.com' in url:
+                    self._queue_sheet_update(row_num, url, None, "Invalid URL format")
+                else:
+                    logger.error(f"Invalid Instagram URL in row {row_num}: {url}")
+                    self._queue_sheet_update(row_num, url, None, "Invalid URL")
+                continue
+
+            # URL variants of the same post (query strings, /reel/ vs /p/) share a fetch
+            posts.setdefault(shortcode, []).append((row_num, url))
+
+        return posts
+
+    def _process_post(self, shortcode: str, rows: List[Tuple[int, str]]) -> int:
+        """Extract one post and queue sheet updates for every row that requested it"""
+        row_num, url = rows[0]
+
+        try:
+            logger.info(f"Processing manual request for row {row_num}: {url}")
+
+            # Extract data with fresh session
+            data, status = self._extract_instagram_data(shortcode, row_num)
+
+        except Exception as e:
+            logger.error(f"Row {row_num} processing error: {e}")
+            data, status = None, "Extraction failed"
+
+        for duplicate_row, duplicate_url in rows:
+            self._queue_sheet_update(duplicate_row, duplicate_url, data, status)
+
+        row_list = ', '.join(str(r) for r, _ in rows)
+
+        if status == "Success":
+            logger.info(f"Row(s) {row_list} - Account: @{data['account']}, Likes: {data['likes']:,}, Comments: {data['comments']:,}")
+            return len(rows)
+
+        logger.warning(f"Manual processing failed for row(s) {row_list}: {status}")
+        return 0
+
     def process_manual_request(self) -> bool:
         """Process manual extraction request"""
         logger.info("Starting manual Instagram data processing")
+        self._run_timestamp = self._get_ist_timestamp()
+        self._fetch_deadline = time.monotonic() + self.fetch_time_budget
 
         try:
-            # Find row that needs processing
-            row_num = self._find_requested_row()
+            # Single read serves the header check, the row search and the URLs
+            all_data = self._read_request_columns()
 
-            if not row_num:
+            if self._setup_professional_headers(all_data[0] if all_data else []):
+                all_data = []
+
+            # Find rows that need processing
+            requested_rows = self._find_requested_rows(all_data)
+
+            if not requested_rows:
                 logger.info("No manual processing requests found")
                 return False
 
-            # Get URL from the row
-            row_data = self.worksheet.row_values(row_num)
-            if len(row_data) < 2 or not row_data[1]:
-                logger.error(f"No URL found in row {row_num}")
-                return False
+            posts = self._group_requested_rows(all_data, requested_rows)
 
-            url = row_data[1].strip()
+            # Log in only if some post actually has to come from Instagram
+            if any(self._get_cached_post(shortcode) is None for shortcode in posts):
+                self._prepare_instagram_login()
 
-            if not url.startswith('http') or 'instagram.com' not in url:
-                logger.error(f"Invalid Instagram URL in row {row_num}: {url}")
-                self._update_sheet_professionally(row_num, url, None, "Invalid URL")
-                return False
+            successful_rows = 0
+            sheet_updated = True
 
-            logger.info(f"Processing manual request for row {row_num}: {url}")
+            # Fetch each post once, concurrently; each worker uses its own fresh session
+            with ThreadPoolExecutor(max_workers=self.max_fetch_workers) as executor:
+                futures = [executor.submit(self._process_post, shortcode, rows) for shortcode, rows in posts.items()]
 
-            # Extract data with fresh session
-            data, status = self._extract_instagram_data(url, row_num)
+                for future in as_completed(futures):
+                    successful_rows += future.result()
 
-            # Update sheet
-            success = self._update_sheet_professionally(row_num, url, data, status)
+                    # Write finished rows while the remaining fetches are in flight
+                    if len(self._pending_rows) >= FLUSH_EVERY_ROWS:
+                        sheet_updated = self._flush_sheet_updates() and sheet_updated
 
-            if success and status == "Success":
-                logger.info(f"Manual processing completed successfully for row {row_num}")
-                logger.info(f"Account: @{data['account']}, Likes: {data['likes']:,}, Comments: {data['comments']:,}")
-                return True
-            else:
-                logger.warning(f"Manual processing failed for row {row_num}: {status}")
+            # Update sheet
+            if not self._flush_sheet_updates() or not sheet_updated:
                 return False
 
+            logger.info(f"Manual processing completed for {successful_rows}/{len(requested_rows)} row(s)")
+            return successful_rows > 0
+
         except Exception as e:
             logger.error(f"Manual processing error: {e}")
             return False
@@ -352,17 +945,17 @@ def main():
     """Main function for manual processing"""
     sheet_id = os.environ.get('SHEET_ID')
     credentials_json = os.environ.get('CREDENTIALS_JSON')
+    credentials_path = os.environ.get('CREDENTIALS_JSON_PATH')
 
-    if not sheet_id or not credentials_json:
+    if not sheet_id or not (credentials_json or credentials_path):
         logger.error("Environment variables not found")
         return
 
     try:
         logger.info("Initializing Manual Instagram Processor")
-        processor = ManualInstagramProcessor(sheet_id, credentials_json)
-
-        # Process manual request
-        processed = processor.process_manual_request()
+        with ManualInstagramProcessor(sheet_id, credentials_json, credentials_path) as processor:
+            # Process manual request
+            processed = processor.process_manual_request()
 
         if processed:
             logger.info("Manual processing completed successfully")
@@ -371,7 +964,6 @@ def main():
 
     except Exception as e:
         logger.error(f"Application error: {e}")
-        import traceback
         logger.error(traceback.format_exc())
 
 if __name__ == "__main__":